@@ -1,6 +1,5 @@
 from django.contrib import admin
 
-from scheduler import views
 from scheduler.models import Queue
 from scheduler.models.worker import Worker
 
@@ -32,6 +31,7 @@ class QueueAdmin(ImmutableAdmin):
 
     def changelist_view(self, request, extra_context=None):
         """The 'change list' admin view for this model."""
+        from scheduler import views
         return views.stats(request)
 
 
@@ -41,4 +41,5 @@ class WorkerAdmin(ImmutableAdmin):
 
     def changelist_view(self, request, extra_context=None):
         """The 'change list' admin view for this model."""
+        from scheduler import views
         return views.workers(request)
@@ -1,37 +1,212 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List
+
 import redis
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.contenttypes.admin import GenericStackedInline
+from django.contrib.contenttypes.forms import BaseGenericInlineFormSet
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from scheduler import tools
-from scheduler.models import CronTask, TaskArg, TaskKwarg, RepeatableTask, ScheduledTask
+from scheduler.models import BaseTask, CronTask, TaskArg, TaskKwarg, RepeatableTask, ScheduledTask
+from scheduler.queues import get_queue
 from scheduler.settings import SCHEDULER_CONFIG, logger
-from scheduler.tools import get_job_executions
+from scheduler.tools import get_job_executions_page
+
+# Admin selections are usually small, no need for Django's default 2000-rows cursor fetch
+_ACTION_CHUNK_SIZE = 200
+
+# Upper bound on queues enqueued concurrently by the enqueue_job_now action
+_ENQUEUE_MAX_WORKERS = 16
+
+# After a redis connection error, the change view skips the queue's executions for a while
+# instead of waiting for the connection timeout on every page view
+_REDIS_OUTAGE_BACKOFF_SECONDS = 30
+_redis_outage_until: Dict[str, float] = dict()
+
+
+def _enqueue_tasks_to_run(queue_name: str, tasks: List[BaseTask]) -> None:
+    """Enqueue tasks of the same asynchronous queue to run now using a single pipeline.
+    Sets the new job ids and the modified time on the tasks, saving them is left to the caller.
+    """
+    queue = get_queue(queue_name)
+    with queue.connection.pipeline() as pipeline:
+        jobs = queue.enqueue_many([task._enqueue_data(queue) for task in tasks], pipeline=pipeline)
+        pipeline.execute()
+    now = timezone.now()
+    for task, job in zip(tasks, jobs):
+        task.job_id = job.id
+        task.modified = now
+
+
+def _unschedule_tasks(queryset) -> None:
+    """Remove the jobs of the tasks in the queryset from their queues, using a single pipeline per queue.
+    Does not reset the job_id of the tasks.
+    """
+    scheduled_jobs = queryset.filter(job_id__isnull=False).order_by('queue').values_list('queue', 'job_id')
+    for queue_name, jobs in groupby(scheduled_jobs, key=itemgetter(0)):
+        queue = get_queue(queue_name)
+        scheduled_job_registry = queue.scheduled_job_registry
+        with queue.connection.pipeline() as pipeline:
+            for _queue_name, job_id in jobs:
+                queue.remove(job_id, pipeline=pipeline)
+                scheduled_job_registry.remove(job_id, pipeline=pipeline)
+            pipeline.execute()
+
+
+def _page_number(request, page_var: str) -> int:
+    try:
+        return max(int(request.GET.get(page_var, 1)), 1)
+    except ValueError:
+        return 1
+
+
+def _schedule_tasks(model, ids: List[int]) -> None:
+    """Schedule the tasks with the given ids, for tasks enabled by a bulk update that skipped save()."""
+    for task in model.objects.filter(pk__in=ids).iterator(chunk_size=_ACTION_CHUNK_SIZE):
+        task.schedule()
+
+
+@lru_cache(maxsize=1024)
+def _next_cron_time_cached(cron_string: str, period: int):
+    # Changelists tend to repeat the same cron strings, the period is part of the key so entries expire
+    return tools.get_next_cron_time(cron_string)
+
+
+class _ExecutionsPage(object):
+    """A window of task executions, navigable without counting all executions of the task"""
+
+    def __init__(self, object_list, number: int, has_next: bool):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        return self.number - 1
+
+
+_HIDDEN_JS = ('admin/js/jquery.init.js',)
+_JOB_ARG_FIELDSETS = (
+    (None, {
+        'fields': (('arg_type', 'val',),),
+    }),
+)
+_JOB_KWARG_FIELDSETS = (
+    (None, {
+        'fields': (('key',), ('arg_type', 'val',),),
+    }),
+)
+
+
+class _TaskChangeList(ChangeList):
+    def get_results(self, request):
+        super(_TaskChangeList, self).get_results(request)
+        # Restrict only the displayed rows, actions get the full rows of self.queryset
+        self.result_list = self.result_list.only(*self.model_admin._list_only_fields)
+
+
+class _PaginatedGenericInlineFormSet(BaseGenericInlineFormSet):
+    """Generic inline formset editing a single page of the related objects"""
+    page_var = 'p'
+    page_number = 1
+    per_page = 10
+    query_params = QueryDict()
+
+    def get_queryset(self):
+        if not hasattr(self, '_page_objects'):
+            offset = (self.page_number - 1) * self.per_page
+            # Fetch one extra row to know whether there is a next page without counting all rows
+            queryset = super(_PaginatedGenericInlineFormSet, self).get_queryset()
+            objects = list(queryset[offset:offset + self.per_page + 1])
+            self._has_next = len(objects) > self.per_page
+            self._page_objects = objects[:self.per_page]
+        return self._page_objects
+
+    def has_next(self) -> bool:
+        self.get_queryset()
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.page_number > 1
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+    def _page_url(self, page_number: int) -> str:
+        # Keep the other query parameters, e.g., the other inline pages and _changelist_filters
+        params = self.query_params.copy()
+        params[self.page_var] = str(page_number)
+        return f'?{params.urlencode()}'
+
+    def next_page_url(self) -> str:
+        return self._page_url(self.page_number + 1)
+
+    def previous_page_url(self) -> str:
+        return self._page_url(self.page_number - 1)
+
+
+class PaginatedGenericStackedInline(GenericStackedInline):
+    """Generic stacked inline rendering `per_page` related objects at a time.
+    The page is read from the `<model_name>_page` query parameter.
+    """
+    formset = _PaginatedGenericInlineFormSet
+    template = 'admin/scheduler/edit_inline/stacked_paginated.html'
+    per_page = 10
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super(PaginatedGenericStackedInline, self).get_formset(request, obj, **kwargs)
+        page_var = f'{self.model._meta.model_name}_page'
+        return type(formset.__name__, (formset,), dict(
+            page_var=page_var,
+            page_number=_page_number(request, page_var),
+            query_params=request.GET,
+            per_page=self.per_page,
+        ))
 
 
 class HiddenMixin(object):
     class Media:
-        js = ['admin/js/jquery.init.js', ]
+        js = _HIDDEN_JS
 
 
-class JobArgInline(HiddenMixin, GenericStackedInline):
+class JobArgInline(HiddenMixin, PaginatedGenericStackedInline):
     model = TaskArg
     extra = 0
-    fieldsets = (
-        (None, {
-            'fields': (('arg_type', 'val',),),
-        }),
-    )
+    fieldsets = _JOB_ARG_FIELDSETS
 
 
-class JobKwargInline(HiddenMixin, GenericStackedInline):
+class JobKwargInline(HiddenMixin, PaginatedGenericStackedInline):
     model = TaskKwarg
     extra = 0
-    fieldsets = (
-        (None, {
-            'fields': (('key',), ('arg_type', 'val',),),
-        }),
-    )
+    fieldsets = _JOB_KWARG_FIELDSETS
 
 
 _LIST_DISPLAY_EXTRA = dict(
@@ -41,6 +216,7 @@ _LIST_DISPLAY_EXTRA = dict(
         'scheduled_time', 'interval_display', 'successful_runs', 'last_successful_run', 'failed_runs',
         'last_failed_run',),
 )
+_SCHEDULING_TITLE = _('Scheduling')
 _FIELDSET_EXTRA = dict(
     CronTask=(
         'cron_string', 'timeout', 'result_ttl',
@@ -71,6 +247,8 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ('enabled',)
     list_display = ('enabled', 'name', 'job_id', 'function_string', 'is_scheduled', 'queue',)
     list_display_links = ('name',)
+    list_per_page = 50
+    show_full_result_count = False
     readonly_fields = ('job_id',)
     fieldsets = (
         (None, {
@@ -81,39 +259,79 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
 
-    def get_list_display(self, request):
-        if self.model.__name__ not in _LIST_DISPLAY_EXTRA:
+    @cached_property
+    def _list_display(self):
+        extra = _LIST_DISPLAY_EXTRA.get(self.model.__name__)
+        if extra is None:
             raise ValueError(f'Unrecognized model {self.model}')
-        return TaskAdmin.list_display + _LIST_DISPLAY_EXTRA[self.model.__name__]
+        return TaskAdmin.list_display + extra
 
-    def get_fieldsets(self, request, obj=None):
-        if self.model.__name__ not in _FIELDSET_EXTRA:
+    @cached_property
+    def _fieldsets(self):
+        extra = _FIELDSET_EXTRA.get(self.model.__name__)
+        if extra is None:
             raise ValueError(f'Unrecognized model {self.model}')
-        return TaskAdmin.fieldsets + ((_('Scheduling'), {
-            'fields': _FIELDSET_EXTRA[self.model.__name__],
+        return TaskAdmin.fieldsets + ((_SCHEDULING_TITLE, {
+            'fields': extra,
         }),)
 
+    def get_queryset(self, request):
+        # function_string() and __str__ read the args of each task, prefetch them instead of querying per row
+        return super(TaskAdmin, self).get_queryset(request).prefetch_related('callable_args', 'callable_kwargs')
+
+    def save_related(self, request, form, formsets, change):
+        super(TaskAdmin, self).save_related(request, form, formsets, change)
+        # Drop the prefetched args, the inlines may have changed them
+        form.instance.refresh_from_db(fields=['callable_args', 'callable_kwargs'])
+
+    def get_object(self, request, object_id, from_field=None):
+        # change_view() needs the task before the parent view fetches it again, fetch it once per request
+        cache = request.__dict__.setdefault('_task_admin_obj_cache', dict())
+        key = (self.model, object_id, from_field)
+        if key not in cache:
+            cache[key] = super(TaskAdmin, self).get_object(request, object_id, from_field)
+        return cache[key]
+
+    @cached_property
+    def _list_only_fields(self):
+        field_names = {f.name for f in self.model._meta.concrete_fields}
+        # function_string() reads callable, interval_display() reads interval and interval_unit
+        needed = ('id', 'callable', 'interval', 'interval_unit',) + self._list_display
+        return tuple(name for name in needed if name in field_names)
+
+    def get_changelist(self, request, **kwargs):
+        return _TaskChangeList
+
+    def get_list_display(self, request):
+        return self._list_display
+
+    def get_fieldsets(self, request, obj=None):
+        return self._fieldsets
+
     @admin.display(description='Next run')
     def next_run(self, o: CronTask):
-        return tools.get_next_cron_time(o.cron_string)
+        now = int(time.time())
+        # A 6th field is seconds, such cron strings can run several times a minute
+        period = now if len(o.cron_string.split()) > 5 else now // 60
+        return _next_cron_time_cached(o.cron_string, period)
 
     def change_view(self, request, object_id, form_url='', extra_context=None):
         extra = extra_context or {}
         obj = self.get_object(request, object_id)
-        try:
-            execution_list = get_job_executions(obj.queue, obj)
-        except redis.ConnectionError as e:
-            logger.warn(f'Could not get job executions: {e}')
-            execution_list = list()
-        paginator = self.get_paginator(request, execution_list, SCHEDULER_CONFIG['EXECUTIONS_IN_PAGE'])
-        page_number = request.GET.get('p', 1)
-        page_obj = paginator.get_page(page_number)
-        page_range = paginator.get_elided_page_range(page_obj.number)
+        per_page = SCHEDULER_CONFIG['EXECUTIONS_IN_PAGE']
+        page_number = _page_number(request, 'p')
+        execution_list, has_next = list(), False
+        if _redis_outage_until.get(obj.queue, 0) <= time.monotonic():
+            try:
+                execution_list, has_next = get_job_executions_page(
+                    obj.queue, obj, offset=(page_number - 1) * per_page, per_page=per_page)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                logger.warn(f'Could not get job executions: {e}')
+                _redis_outage_until[obj.queue] = time.monotonic() + _REDIS_OUTAGE_BACKOFF_SECONDS
+        page_obj = _ExecutionsPage(execution_list, page_number, has_next)
 
         extra.update({
-            "pagination_required": paginator.count > SCHEDULER_CONFIG['EXECUTIONS_IN_PAGE'],
             'executions': page_obj,
-            'page_range': page_range,
             'page_var': 'p',
         })
 
@@ -121,8 +339,7 @@ class TaskAdmin(admin.ModelAdmin):
             request, object_id, form_url, extra_context=extra)
 
     def delete_queryset(self, request, queryset):
-        for job in queryset:
-            job.unschedule()
+        _unschedule_tasks(queryset)
         super(TaskAdmin, self).delete_queryset(request, queryset)
 
     def delete_model(self, request, obj):
@@ -131,11 +348,10 @@ class TaskAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Disable selected %(verbose_name_plural)s"), permissions=('change',))
     def disable_selected(self, request, queryset):
-        rows_updated = 0
-        for obj in queryset.filter(enabled=True).iterator():
-            obj.enabled = False
-            obj.unschedule()
-            rows_updated += 1
+        with transaction.atomic():
+            tasks = queryset.filter(enabled=True)
+            _unschedule_tasks(tasks)
+            rows_updated = tasks.update(enabled=False, job_id=None, modified=timezone.now())
 
         message_bit = "1 job was" if rows_updated == 1 else f"{rows_updated} jobs were"
 
@@ -144,11 +360,11 @@ class TaskAdmin(admin.ModelAdmin):
 
     @admin.action(description=_("Enable selected %(verbose_name_plural)s"), permissions=('change',))
     def enable_selected(self, request, queryset):
-        rows_updated = 0
-        for obj in queryset.filter(enabled=False).iterator():
-            obj.enabled = True
-            obj.save()
-            rows_updated += 1
+        with transaction.atomic():
+            ids = list(queryset.filter(enabled=False).values_list('pk', flat=True))
+            rows_updated = self.model.objects.filter(pk__in=ids).update(enabled=True, modified=timezone.now())
+            # Jobs pushed to redis are not rolled back, schedule only once the tasks are enabled
+            transaction.on_commit(partial(_schedule_tasks, self.model, ids))
 
         message_bit = "1 job was" if rows_updated == 1 else f"{rows_updated} jobs were"
         level = messages.WARNING if not rows_updated else messages.INFO
@@ -156,8 +372,28 @@ class TaskAdmin(admin.ModelAdmin):
 
     @admin.action(description="Enqueue now", permissions=('change',))
     def enqueue_job_now(self, request, queryset):
-        task_names = []
-        for task in queryset:
+        tasks_by_queue = defaultdict(list)
+        sync_tasks = list()
+        is_async_queue = dict()
+        tasks = queryset.prefetch_related(None).only(*self.model.ENQUEUE_FIELDS)
+        for task in tasks.iterator(chunk_size=_ACTION_CHUNK_SIZE):
+            if task.queue not in is_async_queue:
+                is_async_queue[task.queue] = get_queue(task.queue).is_async
+            if is_async_queue[task.queue]:
+                tasks_by_queue[task.queue].append(task)
+            else:
+                sync_tasks.append(task)
+        # Synchronous queues run the job while enqueuing it, before a pipeline would be executed
+        for task in sync_tasks:
             task.enqueue_to_run()
-            task_names.append(task.name)
-        self.message_user(request, f"The following jobs have been enqueued: {', '.join(task_names)}", )
+        if len(tasks_by_queue) == 1:
+            _enqueue_tasks_to_run(*next(iter(tasks_by_queue.items())))
+        elif tasks_by_queue:
+            # Queues may live on different redis servers, run their pipelines concurrently.
+            # Only asynchronous queues are handed to the pool, it must not run jobs or use the DB.
+            with ThreadPoolExecutor(max_workers=_ENQUEUE_MAX_WORKERS) as executor:
+                list(executor.map(_enqueue_tasks_to_run, tasks_by_queue.keys(), tasks_by_queue.values()))
+        enqueued_tasks = [task for tasks in tasks_by_queue.values() for task in tasks]
+        self.model.objects.bulk_update(enqueued_tasks, ['job_id', 'modified'])
+        task_names = ', '.join(task.name for task in sync_tasks + enqueued_tasks)
+        self.message_user(request, f"The following jobs have been enqueued: {task_names}", )
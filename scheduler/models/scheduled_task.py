@@ -69,6 +69,8 @@ class BaseTask(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
     TASK_TYPE = 'BaseTask'
+    # Fields read by _enqueue_args and written when enqueuing, enough to enqueue a task loaded with `.only()`
+    ENQUEUE_FIELDS = ('id', 'name', 'queue', 'job_id', 'modified', 'at_front', 'timeout', 'result_ttl',)
     name = models.CharField(
         _('name'), max_length=128, unique=True,
         help_text='Name of the job.', )
@@ -156,6 +158,10 @@ class BaseTask(models.Model):
         - ensure a callback to reschedule the job next iteration.
         - Set job-id to proper format
         - set job meta
+
+        The admin enqueues tasks loaded with `.only(*ENQUEUE_FIELDS)` from worker threads,
+        fields read here and in subclasses must be listed in ENQUEUE_FIELDS,
+        otherwise a deferred field is loaded by a query off the request thread.
         """
         res = dict(
             meta=dict(
@@ -212,6 +218,13 @@ class BaseTask(models.Model):
         super(BaseTask, self).save()
         return True
 
+    def _enqueue_data(self, queue: DjangoQueue):
+        """Job data for enqueuing the task to run now, in a batch using DjangoQueue.enqueue_many."""
+        kwargs = self._enqueue_args()
+        if 'job_timeout' in kwargs:
+            kwargs['timeout'] = kwargs.pop('job_timeout')
+        return queue.prepare_data(tools.run_task, args=(self.TASK_TYPE, self.id), **kwargs)
+
     def enqueue_to_run(self) -> bool:
         """Enqueue job to run now."""
         kwargs = self._enqueue_args()
@@ -373,6 +386,7 @@ class RepeatableTask(RepeatableMixin, ScheduledTimeMixin, BaseTask):
         _('repeat'), blank=True, null=True,
         help_text=_('Number of times to run the job. Leaving this blank means it will run forever.'), )
     TASK_TYPE = 'RepeatableTask'
+    ENQUEUE_FIELDS = BaseTask.ENQUEUE_FIELDS + ('interval', 'interval_unit', 'repeat',)
 
     def clean(self):
         super(RepeatableTask, self).clean()
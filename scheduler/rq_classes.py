@@ -1,4 +1,4 @@
-from typing import List, Any, Optional, Union
+from typing import List, Any, Optional, Union, Set
 
 import django
 from django.apps import apps
@@ -215,6 +215,13 @@ class DjangoQueue(Queue):
         res.extend(self.canceled_job_registry.get_job_ids())
         return res
 
+    def get_active_job_ids(self) -> Set[str]:
+        """Ids of jobs that are queued, scheduled or started"""
+        res = set(self.get_job_ids())
+        res.update(self.scheduled_job_registry.get_job_ids())
+        res.update(self.started_job_registry.get_job_ids())
+        return res
+
     def get_all_jobs(self):
         job_ids = self.get_all_job_ids()
         return compact([self.fetch_job(job_id) for job_id in job_ids])
@@ -238,11 +245,20 @@ class DjangoScheduler(RQScheduler):
 
     @staticmethod
     def reschedule_all_jobs():
+        # Read the active job ids once per queue, so tasks that are already scheduled
+        # are skipped without querying redis for each task
+        active_job_ids = dict()
         for model_name in MODEL_NAMES:
             model = apps.get_model(app_label='scheduler', model_name=model_name)
             enabled_jobs = model.objects.filter(enabled=True)
-            unscheduled_jobs = filter(lambda j: j.ready_for_schedule(), enabled_jobs)
-            for item in unscheduled_jobs:
+            for item in enabled_jobs:
+                if item.job_id is not None:
+                    if item.queue not in active_job_ids:
+                        active_job_ids[item.queue] = item.rqueue.get_active_job_ids()
+                    if item.job_id in active_job_ids[item.queue]:
+                        continue
+                if not item.ready_for_schedule():
+                    continue
                 logger.debug(f"Rescheduling {str(item)}")
                 item.save()
 
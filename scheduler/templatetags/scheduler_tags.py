@@ -1,9 +1,9 @@
 from typing import Dict
 
 from django import template
-from django.utils.safestring import mark_safe
+from django.urls import reverse
 
-from scheduler.rq_classes import JobExecution, DjangoQueue
+from scheduler.rq_classes import JobExecution, DjangoQueue, MODEL_NAMES
 from scheduler.tools import get_scheduled_task
 
 register = template.Library()
@@ -16,7 +16,7 @@ def show_func_name(rq_job: JobExecution) -> str:
         if res == 'scheduler.tools.run_task':
             task = get_scheduled_task(*rq_job.args)
             res = task.function_string()
-        return mark_safe(res)
+        return res
     except Exception as e:
         return repr(e)
 
@@ -28,8 +28,11 @@ def get_item(dictionary: Dict, key):
 
 @register.filter
 def scheduled_job(job: JobExecution):
-    django_scheduled_job = get_scheduled_task(*job.args)
-    return django_scheduled_job.get_absolute_url()
+    # The link only needs the task model and id, no need to fetch the task
+    task_model, task_id = job.args
+    if task_model not in MODEL_NAMES:
+        raise ValueError(f'Job Model {task_model} does not exist, choices are {MODEL_NAMES}')
+    return reverse(f'admin:scheduler_{task_model.lower()}_change', args=[task_id, ])
 
 
 @register.filter
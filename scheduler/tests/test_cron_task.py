@@ -1,4 +1,8 @@
+from datetime import datetime
+
+from django.contrib import admin
 from django.core.exceptions import ValidationError
+from freezegun import freeze_time
 
 from scheduler import settings
 from scheduler.models import CronTask
@@ -74,3 +78,19 @@ class TestCronTask(BaseTestCases.TestBaseTask):
         worker.refresh()
         self.assertEqual(20, worker.successful_job_count)
         self.assertEqual(0, worker.failed_job_count)
+
+    def test_admin_next_run(self):
+        task = task_factory(CronTask, cron_string='0 0 * * *')
+        task_admin = admin.site._registry[CronTask]
+        with freeze_time('2016-12-25 08:00:10'):
+            self.assertEqual(datetime(2016, 12, 26), task_admin.next_run(task))
+        with freeze_time('2016-12-26 08:00:10'):
+            self.assertEqual(datetime(2016, 12, 27), task_admin.next_run(task))
+
+    def test_admin_next_run_with_seconds(self):
+        task = task_factory(CronTask, cron_string='* * * * * */40')
+        task_admin = admin.site._registry[CronTask]
+        with freeze_time('2016-12-25 08:00:10'):
+            self.assertEqual(datetime(2016, 12, 25, 8, 0, 40), task_admin.next_run(task))
+        with freeze_time('2016-12-25 08:00:50'):
+            self.assertEqual(datetime(2016, 12, 25, 8, 1), task_admin.next_run(task))
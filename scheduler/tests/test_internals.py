@@ -3,8 +3,9 @@ from datetime import timedelta
 from django.utils import timezone
 
 from scheduler.models import ScheduledTask
+from scheduler.rq_classes import DjangoScheduler
 from scheduler.tests.testtools import SchedulerBaseCase, task_factory
-from scheduler.tools import get_scheduled_task
+from scheduler.tools import get_scheduled_task, get_job_executions_page
 
 
 class TestInternals(SchedulerBaseCase):
@@ -15,3 +16,36 @@ class TestInternals(SchedulerBaseCase):
             get_scheduled_task(task.TASK_TYPE, task.id + 1)
         with self.assertRaises(ValueError):
             get_scheduled_task('UNKNOWN_JOBTYPE', task.id)
+
+    def test_get_job_executions_page(self):
+        task = task_factory(ScheduledTask)
+        other_task = task_factory(ScheduledTask)
+        for _ in range(3):
+            task.enqueue_to_run()
+        # task has a scheduled job and 3 enqueued jobs
+        executions, has_next = get_job_executions_page(task.queue, task, offset=0, per_page=3)
+        self.assertEqual(3, len(executions))
+        self.assertTrue(has_next)
+        self.assertTrue(all(j.is_execution_of(task) for j in executions))
+        executions, has_next = get_job_executions_page(task.queue, task, offset=3, per_page=3)
+        self.assertEqual(1, len(executions))
+        self.assertFalse(has_next)
+        executions, has_next = get_job_executions_page(other_task.queue, other_task, offset=0, per_page=3)
+        self.assertEqual(1, len(executions))
+        self.assertFalse(has_next)
+
+    def test_reschedule_all_jobs(self):
+        scheduled_task = task_factory(ScheduledTask)
+        job_id = scheduled_task.job_id
+        lost_task = task_factory(ScheduledTask)
+        lost_job_id = lost_task.job_id
+        lost_task.rqueue.scheduled_job_registry.remove(lost_job_id)
+
+        DjangoScheduler.reschedule_all_jobs()
+
+        scheduled_task.refresh_from_db()
+        self.assertEqual(job_id, scheduled_task.job_id)
+        lost_task.refresh_from_db()
+        self.assertIsNotNone(lost_task.job_id)
+        self.assertNotEqual(lost_job_id, lost_task.job_id)
+        self.assertTrue(lost_task.is_scheduled())
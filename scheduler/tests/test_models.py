@@ -1,14 +1,21 @@
 import zoneinfo
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
+import redis
+
+from django.contrib import admin
 from django.contrib.messages import get_messages
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from freezegun import freeze_time
 
 from scheduler import settings
+from scheduler.admin import task_models as task_admin_module
 from scheduler.models import BaseTask, TaskArg, TaskKwarg, ScheduledTask
 from scheduler.tools import run_task, create_worker
 from . import jobs
@@ -262,6 +269,67 @@ class BaseTestCases:
             # assert
             self.assertEqual(200, res.status_code)
 
+        def test_admin_list_view_queries_do_not_grow_with_args(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, )
+            taskarg_factory(TaskArg, content_object=task)
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(url)
+            num_queries = len(ctx.captured_queries)
+            for _ in range(3):
+                other_task = task_factory(self.TaskModelClass, )
+                taskarg_factory(TaskArg, content_object=other_task)
+                taskarg_factory(TaskKwarg, content_object=other_task)
+            # act
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(url)
+            # assert
+            self.assertEqual(200, res.status_code)
+            self.assertEqual(num_queries, len(ctx.captured_queries))
+            # only the filtered count is queried
+            self.assertEqual(1, len([q for q in ctx.captured_queries if q['sql'].startswith('SELECT COUNT(*)')]))
+            # columns not displayed in the list are not selected
+            self.assertFalse(any('"result_ttl"' in q['sql'] for q in ctx.captured_queries))
+
+        def test_admin_list_view_actions_get_full_rows(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, )
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            # act
+            res = self.client.get(url)
+            # assert
+            cl = res.context['cl']
+            self.assertIn('result_ttl', cl.result_list[0].get_deferred_fields())
+            # actions receive cl.get_queryset()
+            self.assertEqual(set(), cl.get_queryset(res.wsgi_request)[0].get_deferred_fields())
+
+        def test_admin_save_related_drops_prefetched_args(self):
+            # arrange
+            task = task_factory(self.TaskModelClass, )
+            taskarg_factory(TaskArg, val='one', content_object=task)
+            task_admin = admin.site._registry[self.TaskModelClass]
+            task = task_admin.get_queryset(None).get(pk=task.pk)
+            taskarg_factory(TaskArg, val='two', content_object=task)
+
+            class _Form:
+                instance = task
+
+                def save_m2m(self):
+                    pass
+
+            # act
+            with CaptureQueriesContext(connection) as ctx:
+                task_admin.save_related(None, _Form(), [], True)
+            # assert
+            self.assertEqual(0, len(ctx.captured_queries))
+            self.assertEqual(2, task.callable_args.count())
+            self.assertEqual(['one', 'two'], [arg.val for arg in task.callable_args.all()])
+
         def test_admin_list_view_delete_model(self):
             # arrange
             self.client.login(username='admin', password='admin')
@@ -304,6 +372,42 @@ class BaseTestCases:
             # assert
             self.assertEqual(200, res.status_code)
 
+        def test_admin_change_view_paginates_args(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, )
+            args = [taskarg_factory(TaskArg, val=f'arg{i}', content_object=task) for i in range(12)]
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_change', args=[task.pk, ])
+            # act
+            first_page = self.client.get(url)
+            second_page = self.client.get(url, {'taskarg_page': 2, 'p': 3, '_changelist_filters': 'enabled__exact=1'})
+            # assert
+            self.assertEqual(200, first_page.status_code)
+            formset = first_page.context['inline_admin_formsets'][0].formset
+            self.assertEqual(args[:10], [form.instance for form in formset.initial_forms])
+            self.assertContains(first_page, '?taskarg_page=2')
+            formset = second_page.context['inline_admin_formsets'][0].formset
+            self.assertEqual(args[10:], [form.instance for form in formset.initial_forms])
+            self.assertEqual(
+                '?taskarg_page=1&p=3&_changelist_filters=enabled__exact%3D1', formset.previous_page_url())
+            self.assertContains(second_page, 'href="?taskarg_page=1&amp;p=3&amp;_changelist_filters=')
+
+        def test_admin_change_view_fetches_task_once(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, )
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_change', args=[task.pk, ])
+            table = f'FROM "{self.TaskModelClass._meta.db_table}"'
+            # act
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.get(url)
+            # assert
+            self.assertEqual(200, res.status_code)
+            task_queries = [q for q in ctx.captured_queries if table in q['sql']]
+            self.assertEqual(1, len(task_queries))
+
         def test_admin_change_view__bad_redis_connection(self):
             # arrange
             self.client.login(username='admin', password='admin')
@@ -316,6 +420,44 @@ class BaseTestCases:
             # assert
             self.assertEqual(200, res.status_code)
 
+        def test_admin_change_view__bad_redis_connection_skips_redis_after_error(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, queue='test2', instance_only=True)
+            task.save(schedule_job=False)
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_change', args=[task.pk, ])
+            task_admin_module._redis_outage_until.clear()
+            self.addCleanup(task_admin_module._redis_outage_until.clear)
+            # act
+            with patch('scheduler.admin.task_models.get_job_executions_page',
+                       side_effect=redis.ConnectionError('connection refused')) as get_executions_mock:
+                res1 = self.client.get(url)
+                res2 = self.client.get(url)
+            # assert
+            self.assertEqual(200, res1.status_code)
+            self.assertEqual(200, res2.status_code)
+            self.assertEqual(1, get_executions_mock.call_count)
+
+        def test_admin_change_view__redis_timeout_skips_redis_after_error(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, queue='test2', instance_only=True)
+            task.save(schedule_job=False)
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_change', args=[task.pk, ])
+            task_admin_module._redis_outage_until.clear()
+            self.addCleanup(task_admin_module._redis_outage_until.clear)
+            # act
+            with patch('scheduler.admin.task_models.get_job_executions_page',
+                       side_effect=redis.TimeoutError('Timeout connecting to server')) as get_executions_mock:
+                res1 = self.client.get(url)
+                res2 = self.client.get(url)
+            # assert
+            self.assertEqual(200, res1.status_code)
+            self.assertEqual(200, res2.status_code)
+            self.assertEqual(1, get_executions_mock.call_count)
+
         def test_admin_enqueue_job_now(self):
             # arrange
             self.client.login(username='admin', password='admin')
@@ -350,6 +492,71 @@ class BaseTestCases:
             self.assertEqual(scheduled_task_id, task.id)
             assert_has_execution_with_status(task, 'finished')
 
+        def test_admin_enqueue_multiple_jobs_now(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            tasks = [task_factory(self.TaskModelClass, queue=name) for name in ('default', 'test3', 'test3')]
+            data = {
+                'action': 'enqueue_job_now',
+                '_selected_action': [task.id for task in tasks],
+            }
+            model = tasks[0]._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            select_tasks = f'SELECT "{self.TaskModelClass._meta.db_table}".'
+            modified = max(task.modified for task in tasks)
+            # act
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(url, data=data)
+            # assert
+            self.assertEqual(302, res.status_code)
+            task_queries = [q for q in ctx.captured_queries if q['sql'].startswith(select_tasks)]
+            self.assertEqual(1, len(task_queries))
+            for task in tasks:
+                task.refresh_from_db()
+                self.assertIn(task.job_id, get_queue(task.queue).get_job_ids())
+                self.assertGreater(task.modified, modified)
+                assert_has_execution_with_status(task, 'queued')
+
+        def test_admin_enqueue_job_now_sync_queue(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            task = task_factory(self.TaskModelClass, queue='async')
+            data = {
+                'action': 'enqueue_job_now',
+                '_selected_action': [task.id, ],
+            }
+            model = task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            modified = task.modified
+            # act
+            res = self.client.post(url, data=data)
+            # assert
+            self.assertEqual(302, res.status_code)
+            task.refresh_from_db()
+            self.assertGreater(task.modified, modified)
+            job = get_queue(task.queue).fetch_job(task.job_id)
+            self.assertEqual('finished', job.get_status())
+
+        def test_admin_enqueue_job_now_single_queue_skips_executor(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            tasks = [task_factory(self.TaskModelClass, queue=name) for name in ('default', 'async')]
+            data = {
+                'action': 'enqueue_job_now',
+                '_selected_action': [task.id for task in tasks],
+            }
+            model = tasks[0]._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            # act
+            with patch.object(task_admin_module, 'ThreadPoolExecutor') as executor_mock:
+                res = self.client.post(url, data=data)
+            # assert
+            self.assertEqual(302, res.status_code)
+            executor_mock.assert_not_called()
+            for task in tasks:
+                task.refresh_from_db()
+                self.assertIsNotNone(get_queue(task.queue).fetch_job(task.job_id))
+
         def test_admin_enable_job(self):
             # arrange
             self.client.login(username='admin', password='admin')
@@ -363,13 +570,16 @@ class BaseTestCases:
             model = task._meta.model.__name__.lower()
             url = reverse(f'admin:scheduler_{model}_changelist')
             # act
-            res = self.client.post(url, data=data, follow=True)
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                res = self.client.post(url, data=data, follow=True)
             # assert
             self.assertEqual(200, res.status_code)
             task.refresh_from_db()
             self.assertTrue(task.enabled)
             self.assertTrue(task.is_scheduled())
             assert_response_has_msg(res, '1 job was successfully enabled and scheduled.')
+            # jobs are scheduled only once the tasks are enabled in the DB
+            self.assertEqual(1, len(callbacks))
 
         def test_admin_disable_job(self):
             # arrange
@@ -383,6 +593,7 @@ class BaseTestCases:
             model = task._meta.model.__name__.lower()
             url = reverse(f'admin:scheduler_{model}_changelist')
             self.assertTrue(task.is_scheduled())
+            modified = task.modified
             # act
             res = self.client.post(url, data=data, follow=True)
             # assert
@@ -390,8 +601,33 @@ class BaseTestCases:
             task.refresh_from_db()
             self.assertFalse(task.is_scheduled())
             self.assertFalse(task.enabled)
+            self.assertGreater(task.modified, modified)
             assert_response_has_msg(res, '1 job was successfully disabled and unscheduled.')
 
+        def test_admin_disable_multiple_jobs(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            tasks = [task_factory(self.TaskModelClass, enabled=True) for _ in range(3)]
+            disabled_task = task_factory(self.TaskModelClass, enabled=False)
+            data = {
+                'action': 'disable_selected',
+                '_selected_action': [task.id for task in tasks] + [disabled_task.id, ],
+            }
+            model = disabled_task._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            job_ids = [task.job_id for task in tasks]
+            # act
+            res = self.client.post(url, data=data, follow=True)
+            # assert
+            self.assertEqual(200, res.status_code)
+            scheduled_jobs = get_queue(disabled_task.queue).scheduled_job_registry.get_job_ids()
+            for task, job_id in zip(tasks, job_ids):
+                task.refresh_from_db()
+                self.assertFalse(task.enabled)
+                self.assertIsNone(task.job_id)
+                self.assertNotIn(job_id, scheduled_jobs)
+            assert_response_has_msg(res, '3 jobs were successfully disabled and unscheduled.')
+
         def test_admin_single_delete(self):
             # arrange
             self.client.login(username='admin', password='admin')
@@ -437,6 +673,27 @@ class BaseTestCases:
             scheduled_jobs = queue.scheduled_job_registry.get_job_ids()
             self.assertNotIn(job_id, scheduled_jobs)
 
+        def test_admin_delete_selected_multiple_queues(self):
+            # arrange
+            self.client.login(username='admin', password='admin')
+            tasks = [task_factory(self.TaskModelClass, queue=name) for name in ('default', 'test3', 'test3')]
+            job_ids = [task.job_id for task in tasks]
+            data = {
+                'action': 'delete_selected',
+                '_selected_action': [task.id for task in tasks],
+                'post': 'yes',
+            }
+            model = tasks[0]._meta.model.__name__.lower()
+            url = reverse(f'admin:scheduler_{model}_changelist')
+            # act
+            res = self.client.post(url, data=data, follow=True)
+            # assert
+            self.assertEqual(200, res.status_code)
+            assert_response_has_msg(res, f'Successfully deleted 3 {self.TaskModelClass._meta.verbose_name_plural}.')
+            self.assertFalse(self.TaskModelClass.objects.filter(id__in=[task.id for task in tasks]).exists())
+            for task, job_id in zip(tasks, job_ids):
+                self.assertNotIn(job_id, get_queue(task.queue).scheduled_job_registry.get_job_ids())
+
     class TestSchedulableJob(TestBaseTask):
         # Currently ScheduledJob and RepeatableJob
         TaskModelClass = ScheduledTask
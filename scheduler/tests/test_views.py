@@ -11,8 +11,8 @@ from scheduler.queues import get_queue
 from scheduler.tools import create_worker
 from . import test_settings  # noqa
 from .jobs import failing_job, long_job, test_job
-from .testtools import assert_message_in_response, task_factory, _get_job_from_scheduled_registry
-from ..models import ScheduledTask
+from .testtools import assert_message_in_response, task_factory, taskarg_factory, _get_job_from_scheduled_registry
+from ..models import ScheduledTask, TaskArg
 from ..rq_classes import JobExecution, ExecutionStatus
 
 
@@ -338,6 +338,19 @@ class ViewTest(BaseTestCase):
         res = self.client.get(url, follow=True)
         self.assertIn('job', res.context)
         self.assertEqual(res.context['job'], job)
+        self.assertContains(res, f'href="{scheduled_job.get_absolute_url()}"')
+
+    def test_scheduled_job_details_escapes_args(self):
+        """Task args are escaped when the job's function is displayed"""
+        scheduled_job = task_factory(ScheduledTask, enabled=True)
+        taskarg_factory(TaskArg, val='<b>bold</b>', content_object=scheduled_job)
+        job = _get_job_from_scheduled_registry(scheduled_job)
+
+        url = reverse('job_details', args=[job.id, ])
+        res = self.client.get(url, follow=True)
+        self.assertEqual(200, res.status_code)
+        self.assertNotContains(res, '<b>bold</b>')
+        self.assertContains(res, '&lt;b&gt;bold&lt;/b&gt;')
 
     def test_job_details_on_deleted_dependency(self):
         """Page doesn't crash even if job.dependency has been deleted"""
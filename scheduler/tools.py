@@ -1,12 +1,13 @@
 import importlib
 import os
+from typing import List, Tuple
 
 import croniter
 from django.apps import apps
 from django.utils import timezone
 
 from scheduler.queues import get_queues, logger, get_queue
-from scheduler.rq_classes import DjangoWorker, MODEL_NAMES
+from scheduler.rq_classes import DjangoWorker, MODEL_NAMES, JobExecution
 from scheduler.settings import get_config
 
 
@@ -75,8 +76,28 @@ def create_worker(*queue_names, **kwargs):
     return worker
 
 
-def get_job_executions(queue_name, scheduled_task):
+def get_job_executions_page(queue_name, scheduled_task, offset: int, per_page: int) -> Tuple[List[JobExecution], bool]:
+    """Get a window of executions of a scheduled task.
+
+    Jobs are fetched in batches and fetching stops once the window is full,
+    so neither all jobs of the queue nor the total number of executions are loaded.
+
+    :returns: The executions in the window, and whether there are more executions after it.
+    """
     queue = get_queue(queue_name)
-    job_list = queue.get_all_jobs()
-    res = list(filter(lambda j: j.is_execution_of(scheduled_task), job_list))
-    return res
+    job_ids = queue.get_all_job_ids()
+    res = list()
+    skipped = 0
+    for i in range(0, len(job_ids), per_page):
+        job_list = queue.job_class.fetch_many(
+            job_ids[i:i + per_page], connection=queue.connection, serializer=queue.serializer)
+        for job in job_list:
+            if job is None or not job.is_execution_of(scheduled_task):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(res) == per_page:
+                return res, True
+            res.append(job)
+    return res, False
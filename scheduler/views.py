@@ -202,7 +202,6 @@ def worker_details(request, name):
     paginator = Paginator(execution_list, SCHEDULER_CONFIG['EXECUTIONS_IN_PAGE'])
     page_number = request.GET.get('p', 1)
     page_obj = paginator.get_page(page_number)
-    page_range = paginator.get_elided_page_range(page_obj.number)
     context_data = {
         **admin.site.each_context(request),
         'queue': queue,
@@ -211,7 +210,6 @@ def worker_details(request, name):
         'job': worker.get_current_job(),
         'total_working_time': worker.total_working_time * 1000,
         'executions': page_obj,
-        'page_range': page_range,
         'page_var': 'p',
     }
     return render(request, 'admin/scheduler/worker_details.html', context_data)